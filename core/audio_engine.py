@@ -4,7 +4,10 @@
 负责音频生成、混合和播放。
 """
 
+import os
 import numpy as np
+from copy import copy
+from concurrent.futures import ThreadPoolExecutor
 from typing import List, Optional
 import pygame
 
@@ -15,6 +18,52 @@ from .track_events import DrumType, DrumEvent
 from .effect_processor import EffectProcessor
 
 
+# 各类打击乐的包络参数（模块级常量，所有打击乐事件共享，只读使用）
+# 底鼓：快速衰减
+_KICK_ADSR = ADSRParams(
+    attack=0.001,   # 极快起音
+    decay=0.05,     # 快速衰减
+    sustain=0.0,   # 不保持
+    release=0.05   # 快速释放
+)
+# 军鼓：中等衰减
+_SNARE_ADSR = ADSRParams(
+    attack=0.001,
+    decay=0.1,
+    sustain=0.1,   # 少量保持
+    release=0.1
+)
+# 踩镲：非常短
+_HIHAT_ADSR = ADSRParams(
+    attack=0.001,
+    decay=0.02,
+    sustain=0.0,
+    release=0.02
+)
+# 吊镲：较长的衰减
+_CRASH_ADSR = ADSRParams(
+    attack=0.001,
+    decay=0.2,
+    sustain=0.05,
+    release=0.3
+)
+_DEFAULT_DRUM_ADSR = ADSRParams()
+
+# 打击乐音色表：类型 -> (噪声类型, 音量系数, ADSR包络)
+_DRUM_VOICES = {
+    # 底鼓：粉噪声（低频更多），短促，快速衰减
+    DrumType.KICK: ("pink", 1.0, _KICK_ADSR),
+    # 军鼓：白噪声（全频段），有"啪"的声音特征
+    DrumType.SNARE: ("white", 1.0, _SNARE_ADSR),
+    # 踩镲：高频噪声，很短的持续时间，稍微降低音量
+    DrumType.HIHAT: ("white", 0.8, _HIHAT_ADSR),
+    # 吊镲：高频噪声，较长的衰减
+    DrumType.CRASH: ("white", 1.0, _CRASH_ADSR),
+}
+# 未知类型默认使用白噪声
+_DEFAULT_DRUM_VOICE = ("white", 1.0, _DEFAULT_DRUM_ADSR)
+
+
 class AudioEngine:
     """音频引擎"""
     
@@ -144,10 +193,15 @@ class AudioEngine:
         num_samples = int(self.sample_rate * duration)
         audio = np.zeros(num_samples, dtype=np.float32)
         
+        # 循环内不变的属性提前取到局部变量，避免每个音符重复查找
+        track_volume = track.volume
+        sample_rate = self.sample_rate
+        generate_note_audio = self.generate_note_audio
+        
         # 生成每个音符的音频并混合
         for note in track.notes:
-            # 跳过休止符（pitch=0）
-            if note.pitch == 0:
+            # 跳过休止符（pitch=0）和力度为0的音符（不会发声）
+            if note.pitch <= 0 or note.velocity <= 0:
                 continue
             
             # 根据BPM比例重新计算时间
@@ -159,17 +213,16 @@ class AudioEngine:
                 continue
             
             # 生成音符音频（使用调整后的持续时间）
-            note_audio = self.generate_note_audio(note, track.volume)
-            # 如果持续时间改变了，需要调整音频长度
+            # 如果持续时间改变了，直接按新的持续时间生成，避免先生成一次再丢弃
             if abs(adjusted_duration - note.duration) > 0.001:
-                # 重新生成音频以匹配新的持续时间
-                from copy import copy
                 adjusted_note = copy(note)
                 adjusted_note.duration = adjusted_duration
-                note_audio = self.generate_note_audio(adjusted_note, track.volume)
+                note_audio = generate_note_audio(adjusted_note, track_volume)
+            else:
+                note_audio = generate_note_audio(note, track_volume)
             
             # 计算音符在音频数组中的位置（使用调整后的开始时间）
-            note_start_sample = int((adjusted_start_time - start_time) * self.sample_rate)
+            note_start_sample = int((adjusted_start_time - start_time) * sample_rate)
             note_end_sample = note_start_sample + len(note_audio)
             
             # 确保不越界
@@ -212,13 +265,14 @@ class AudioEngine:
         
         # 使用当前BPM或默认BPM来计算节拍到秒的转换
         current_bpm = bpm if bpm is not None else 120.0
+        # 每拍对应的秒数（已包含BPM比例），循环外只算一次
+        seconds_per_beat = 60.0 / current_bpm * bpm_ratio
         
         # 确定时间范围（根据BPM比例调整）
         if end_time is None:
             # 找到最后一个打击乐事件的结束时间
             max_end_beat = max(event.end_beat for event in track.drum_events)
-            max_end_time = max_end_beat * 60.0 / current_bpm
-            end_time = max_end_time * bpm_ratio
+            end_time = max_end_beat * seconds_per_beat
         
         duration = (end_time - start_time) * bpm_ratio
         if duration <= 0:
@@ -227,30 +281,35 @@ class AudioEngine:
         num_samples = int(self.sample_rate * duration)
         audio = np.zeros(num_samples, dtype=np.float32)
         
+        # 循环内不变的属性提前取到局部变量，避免每个事件重复查找
+        track_volume = track.volume
+        sample_rate = self.sample_rate
+        generate_drum_audio = self.generate_drum_audio
+        
         # 生成每个打击乐事件的音频并混合
         for event in track.drum_events:
-            # 将节拍转换为秒（使用当前BPM）
-            event_start_time = event.start_beat * 60.0 / current_bpm
-            event_duration = event.duration_beats * 60.0 / current_bpm
+            # 力度为0的事件不会发声，跳过生成
+            if event.velocity <= 0:
+                continue
             
-            # 根据BPM比例重新计算时间
-            adjusted_start_time = event_start_time * bpm_ratio
-            adjusted_duration = event_duration * bpm_ratio
+            # 将节拍转换为秒（使用当前BPM，并按BPM比例调整）
+            adjusted_start_time = event.start_beat * seconds_per_beat
+            adjusted_duration = event.duration_beats * seconds_per_beat
             
             # 检查事件是否在时间范围内
             if adjusted_start_time + adjusted_duration <= start_time or adjusted_start_time >= end_time:
                 continue
             
             # 生成打击乐音频
-            drum_audio = self.generate_drum_audio(
+            drum_audio = generate_drum_audio(
                 event.drum_type,
                 adjusted_duration,
                 event.velocity,
-                track.volume
+                track_volume
             )
             
             # 计算事件在音频数组中的位置
-            event_start_sample = int((adjusted_start_time - start_time) * self.sample_rate)
+            event_start_sample = int((adjusted_start_time - start_time) * sample_rate)
             event_end_sample = event_start_sample + len(drum_audio)
             
             # 确保不越界
@@ -315,20 +374,33 @@ class AudioEngine:
         num_samples = int(self.sample_rate * duration)
         mixed_audio = np.zeros(num_samples, dtype=np.float32)
         
+        # 音量为0的轨道混合后为静音，不必生成音频
+        render_tracks = [track for track in tracks if track.volume > 0]
+        
+        def render(track: Track) -> np.ndarray:
+            return self.generate_track_audio(track, start_time, end_time, bpm, original_bpm)
+        
+        # 各轨道的生成互不依赖，且主要耗时在释放 GIL 的 NumPy 运算中，
+        # 多轨时用线程池并行生成；map 保持轨道顺序，混合仍在本线程串行完成
+        if len(render_tracks) > 1:
+            max_workers = min(len(render_tracks), os.cpu_count() or 1, 8)
+            with ThreadPoolExecutor(max_workers=max_workers) as executor:
+                track_audios = list(executor.map(render, render_tracks))
+        else:
+            track_audios = [render(track) for track in render_tracks]
+        
         # 混合每个轨道
-        for track in tracks:
-            track_audio = self.generate_track_audio(track, start_time, end_time, bpm, original_bpm)
-            
+        for track_audio in track_audios:
             # 确保长度匹配
             min_len = min(len(mixed_audio), len(track_audio))
             mixed_audio[:min_len] += track_audio[:min_len]
         
-        # 归一化，防止削波
-        max_amplitude = np.max(np.abs(mixed_audio))
+        # 归一化，防止削波（原地计算，不额外分配整段缓冲区）
+        max_amplitude = max(float(mixed_audio.max()), -float(mixed_audio.min()))
         if max_amplitude > 1.0:
-            mixed_audio = mixed_audio / max_amplitude
+            mixed_audio /= max_amplitude
         
-        return mixed_audio.astype(np.float32)
+        return mixed_audio
     
     def generate_project_audio(
         self,
@@ -385,10 +457,13 @@ class AudioEngine:
         else:
             volume = volume * self.master_volume  # 结合主音量
         
-        audio_data = audio_data * volume
+        # 乘音量时生成新数组（不修改调用方的数据），之后的限幅和缩放都原地进行
+        audio_data = audio_data * np.float32(volume)
         
         # 转换为16位整数
-        audio_int16 = (np.clip(audio_data, -1.0, 1.0) * 32767).astype(np.int16)
+        np.clip(audio_data, -1.0, 1.0, out=audio_data)
+        audio_data *= 32767
+        audio_int16 = audio_data.astype(np.int16)
         
         # 转换为立体声（左右声道相同）
         stereo = np.column_stack((audio_int16, audio_int16))
@@ -443,70 +518,13 @@ class AudioEngine:
         """
         amplitude = (velocity / 127.0) * track_volume
         
-        if drum_type == DrumType.KICK:
-            # 底鼓：低频噪声，短促，快速衰减
-            noise = self.waveform_generator.generate_noise(
-                duration=duration,
-                amplitude=amplitude,
-                noise_type="pink"  # 粉噪声，低频更多
-            )
-            # 快速衰减的ADSR包络
-            adsr = ADSRParams(
-                attack=0.001,   # 极快起音
-                decay=0.05,     # 快速衰减
-                sustain=0.0,   # 不保持
-                release=0.05   # 快速释放
-            )
-        elif drum_type == DrumType.SNARE:
-            # 军鼓：中高频噪声，有"啪"的声音特征
-            noise = self.waveform_generator.generate_noise(
-                duration=duration,
-                amplitude=amplitude,
-                noise_type="white"  # 白噪声，全频段
-            )
-            # 中等衰减的ADSR包络
-            adsr = ADSRParams(
-                attack=0.001,
-                decay=0.1,
-                sustain=0.1,   # 少量保持
-                release=0.1
-            )
-        elif drum_type == DrumType.HIHAT:
-            # 踩镲：高频噪声，很短的持续时间
-            noise = self.waveform_generator.generate_noise(
-                duration=duration,
-                amplitude=amplitude * 0.8,  # 稍微降低音量
-                noise_type="white"
-            )
-            # 非常短的ADSR包络
-            adsr = ADSRParams(
-                attack=0.001,
-                decay=0.02,
-                sustain=0.0,
-                release=0.02
-            )
-        elif drum_type == DrumType.CRASH:
-            # 吊镲：高频噪声，较长的衰减
-            noise = self.waveform_generator.generate_noise(
-                duration=duration,
-                amplitude=amplitude,
-                noise_type="white"
-            )
-            # 较长的衰减ADSR包络
-            adsr = ADSRParams(
-                attack=0.001,
-                decay=0.2,
-                sustain=0.05,
-                release=0.3
-            )
-        else:
-            # 默认使用白噪声
-            noise = self.waveform_generator.generate_noise(
-                duration=duration,
-                amplitude=amplitude,
-                noise_type="white"
-            )
-            adsr = ADSRParams()
+        noise_type, gain, adsr = _DRUM_VOICES.get(drum_type, _DEFAULT_DRUM_VOICE)
+        
+        noise = self.waveform_generator.generate_noise(
+            duration=duration,
+            amplitude=amplitude * gain,
+            noise_type=noise_type
+        )
         
         # 应用ADSR包络
         waveform = self.envelope_processor.apply_adsr_to_waveform(noise, adsr)
@@ -28,9 +28,9 @@ class TrackType(Enum):
     DRUM_TRACK = "drum"    # 打击乐音轨
 
 
-@dataclass
+@dataclass(slots=True)
 class ADSRParams:
-    """ADSR包络参数"""
+    """ADSR包络参数（每个音符都持有一份，使用__slots__减少内存占用）"""
     attack: float = 0.01   # 起音时间（秒）
     decay: float = 0.1     # 衰减时间（秒）
     sustain: float = 0.7   # 延音级别（0-1）
@@ -63,9 +63,9 @@ NOTE_VALUE_QUARTER = 4    # 四分音符（1拍）
 NOTE_VALUE_EIGHTH = 8     # 八分音符（0.5拍）
 NOTE_VALUE_SIXTEENTH = 16 # 十六分音符（0.25拍）
 
-@dataclass
+@dataclass(slots=True)
 class Note:
-    """音符数据模型"""
+    """音符数据模型（使用__slots__，减少大量音符时的内存占用）"""
     pitch: int              # MIDI音高（0-127），0表示休止符（空白音符）
     start_time: float       # 开始时间（秒）- 仅用于运行时，不存储到JSON
     duration: float         # 持续时间（秒）- 仅用于运行时，不存储到JSON
@@ -465,18 +465,13 @@ class Track:
         
         # 音符音轨：处理 notes
         notes_data = data.get("notes", [])
-        notes = []
         
-        for note_data in notes_data:
-            pitch = note_data.get("pitch", 0)
-            
-            # 跳过休止符（pitch=0）
-            if pitch == 0:
-                continue
-            
-            # 创建音符
-            note = Note.from_dict_grid(note_data, grid_size, bpm)
-            notes.append(note)
+        # 一次性构建音符列表，跳过休止符（pitch=0）
+        notes = [
+            Note.from_dict_grid(note_data, grid_size, bpm)
+            for note_data in notes_data
+            if note_data.get("pitch", 0) != 0
+        ]
         
         return cls(
             name=data.get("name", "Track 1"),
@@ -605,14 +600,19 @@ class Project:
         max_duration = 0.0
         for track in self.tracks:
             if track.track_type == TrackType.DRUM_TRACK:
-                # 打击乐音轨：使用 drum_events
-                for event in track.drum_events:
-                    # 将节拍转换为秒（使用项目BPM）
-                    event_end_time = event.end_beat * 60.0 / self.bpm
-                    max_duration = max(max_duration, event_end_time)
+                # 打击乐音轨：先求最大结束节拍，再统一换算为秒（使用项目BPM）
+                max_end_beat = max(
+                    (event.start_beat + event.duration_beats for event in track.drum_events),
+                    default=0.0
+                )
+                track_end_time = max_end_beat * 60.0 / self.bpm
             else:
                 # 音符音轨：使用 notes
-                for note in track.notes:
-                    max_duration = max(max_duration, note.end_time)
+                track_end_time = max(
+                    (note.start_time + note.duration for note in track.notes),
+                    default=0.0
+                )
+            if track_end_time > max_duration:
+                max_duration = track_end_time
         return max_duration
 
@@ -19,7 +19,7 @@ class DrumType(Enum):
     CRASH = "crash"    # 吊镲
 
 
-@dataclass
+@dataclass(slots=True)
 class BassEvent:
     """低音事件（不是音符，是低音线）"""
     pitch: int              # MIDI音高（0-127）
@@ -30,8 +30,8 @@ class BassEvent:
     adsr: Optional[ADSRParams] = None
     
     def __post_init__(self):
+        # ADSR 会被属性面板原地修改，每个事件必须持有独立实例，不能共享默认对象
         if self.adsr is None:
-            from .models import ADSRParams
             self.adsr = ADSRParams()
     
     @property
@@ -67,7 +67,7 @@ class BassEvent:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class DrumEvent:
     """打击乐事件"""
     drum_type: DrumType      # 打击乐类型
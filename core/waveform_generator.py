@@ -11,6 +11,10 @@ from enum import Enum
 from .models import WaveformType
 
 
+# MIDI音符（0-127）到频率的查找表，A4 (MIDI 69) = 440 Hz
+_MIDI_FREQUENCIES = tuple(440.0 * (2.0 ** ((midi_note - 69) / 12.0)) for midi_note in range(128))
+
+
 class WaveformGenerator:
     """波形生成器"""
     
@@ -23,6 +27,32 @@ class WaveformGenerator:
         """
         self.sample_rate = sample_rate
     
+    def _phase_ramp(
+        self,
+        frequency: float,
+        num_samples: int,
+        phase: float = 0.0
+    ) -> np.ndarray:
+        """
+        生成归一化相位序列（每个周期 0-1）
+        
+        直接由采样序号累乘相位增量得到，不再构造时间轴 t。
+        取模前在 float64 中计算，长音符的相位也不会丢失精度。
+        
+        Args:
+            frequency: 频率（Hz）
+            num_samples: 采样点数
+            phase: 初始相位（0-2π）
+        
+        Returns:
+            float32 相位数组，取值范围 [0, 1)
+        """
+        ramp = np.arange(num_samples, dtype=np.float64)
+        ramp *= frequency / self.sample_rate
+        ramp += phase / (2 * np.pi)
+        np.mod(ramp, 1.0, out=ramp)
+        return ramp.astype(np.float32)
+    
     def generate_square_wave(
         self,
         frequency: float,
@@ -45,14 +75,17 @@ class WaveformGenerator:
             方波数据数组
         """
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, False)
+        phase_norm = self._phase_ramp(frequency, num_samples, phase)
         
-        # 生成方波：使用正弦波和阈值比较
-        wave = np.sin(2 * np.pi * frequency * t + phase)
-        threshold = np.sin(2 * np.pi * duty_cycle)
-        wave = np.where(wave > threshold, amplitude, -amplitude)
+        # 生成方波：每个周期前 duty_cycle 部分为高电平
+        # 在相位缓冲区上原地计算 duty_cycle - phase，再按其符号取 ±amplitude，
+        # 不产生布尔掩码等临时数组。阈值取 duty_cycle 的前一个 float32，
+        # 使差值为 0（符号为正）时仍满足 phase < duty_cycle
+        threshold = np.nextafter(np.float32(duty_cycle), np.float32(-np.inf))
+        wave = np.subtract(threshold, phase_norm, out=phase_norm)
+        np.copysign(np.float32(amplitude), wave, out=wave)
         
-        return wave.astype(np.float32)
+        return wave
     
     def generate_triangle_wave(
         self,
@@ -74,15 +107,16 @@ class WaveformGenerator:
             三角波数据数组
         """
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, False)
+        phase_norm = self._phase_ramp(frequency, num_samples, phase)
         
-        # 三角波：通过锯齿波折叠得到
-        # 先生成锯齿波
-        sawtooth = 2 * ((t * frequency + phase / (2 * np.pi)) % 1) - 1
-        # 折叠成三角波
-        triangle = 2 * np.abs(sawtooth) - 1
+        # 三角波：将相位关于 0.5 折叠，即 4 * |phase - 0.5| - 1
+        # 全部在相位缓冲区上原地完成，不产生临时数组
+        triangle = np.subtract(phase_norm, np.float32(0.5), out=phase_norm)
+        np.abs(triangle, out=triangle)
+        triangle *= np.float32(4 * amplitude)
+        triangle -= np.float32(amplitude)
         
-        return (triangle * amplitude).astype(np.float32)
+        return triangle
     
     def generate_sawtooth_wave(
         self,
@@ -104,10 +138,10 @@ class WaveformGenerator:
             锯齿波数据数组
         """
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, False)
+        phase_norm = self._phase_ramp(frequency, num_samples, phase)
         
         # 锯齿波：线性上升然后突然下降
-        sawtooth = 2 * ((t * frequency + phase / (2 * np.pi)) % 1) - 1
+        sawtooth = 2 * phase_norm - 1
         
         return (sawtooth * amplitude).astype(np.float32)
     
@@ -131,11 +165,14 @@ class WaveformGenerator:
             正弦波数据数组
         """
         num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, False)
+        phase_norm = self._phase_ramp(frequency, num_samples, phase)
         
-        sine = np.sin(2 * np.pi * frequency * t + phase)
+        # 全程保持 float32 连续数组并原地计算，可走 NumPy 的单精度 SIMD sin 实现
+        sine = np.multiply(phase_norm, np.float32(2 * np.pi), out=phase_norm)
+        np.sin(sine, out=sine)
+        sine *= np.float32(amplitude)
         
-        return (sine * amplitude).astype(np.float32)
+        return sine
     
     def generate_noise(
         self,
@@ -230,6 +267,9 @@ class WaveformGenerator:
         Returns:
             频率（Hz）
         """
+        # 标准范围内的整数音符直接查表
+        if isinstance(midi_note, (int, np.integer)) and 0 <= midi_note < 128:
+            return _MIDI_FREQUENCIES[midi_note]
         # A4 (MIDI 69) = 440 Hz
         return 440.0 * (2.0 ** ((midi_note - 69) / 12.0))
     
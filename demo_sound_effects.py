@@ -43,13 +43,11 @@ class SoundEffectGenerator:
         )
         
         # 生成方波，频率随时间变化
-        num_samples = int(self.sample_rate * duration)
-        t = np.linspace(0, duration, num_samples, False)
-        wave = np.zeros(num_samples)
-        
-        for i, freq in enumerate(frequencies):
-            phase = 2 * np.pi * freq * t[i]
-            wave[i] = np.sign(np.sin(phase))  # 方波
+        # 相位（以周期计）按瞬时频率逐点累加（积分），扫频时音高才正确；
+        # 直接用 f(t)*t 会使实际音高偏离频率包络
+        phase = np.cumsum(frequencies / self.sample_rate)
+        # 方波：前半周期为 1，后半周期为 -1，只需取模和比较，无需计算正弦
+        wave = np.where(np.mod(phase, 1.0, out=phase) < 0.5, 1.0, -1.0)
         
         # 应用快速衰减包络
         adsr = ADSRParams(attack=0.01, decay=0.05, sustain=0.0, release=0.09)
@@ -64,52 +62,12 @@ class SoundEffectGenerator:
         
         特点：上升的琶音，明亮欢快
         """
-        duration = 0.3
         # C大调三和弦：C-E-G
         notes = [60, 64, 67]  # C4, E4, G4
-        
-        num_samples = int(self.sample_rate * duration)
-        wave = np.zeros(num_samples)
+        adsr = ADSRParams(attack=0.01, decay=0.05, sustain=0.8, release=0.04)
         
         # 每个音符持续0.1秒
-        note_duration = duration / len(notes)
-        note_samples = int(self.sample_rate * note_duration)
-        
-        for i, midi_note in enumerate(notes):
-            freq = self.waveform_gen.midi_to_frequency(midi_note)
-            start_sample = i * note_samples
-            end_sample = start_sample + note_samples
-            
-            # 确保不越界
-            if end_sample > num_samples:
-                end_sample = num_samples
-            if start_sample >= num_samples:
-                break
-            
-            # 计算实际长度
-            actual_length = end_sample - start_sample
-            
-            # 生成方波
-            t = np.linspace(0, note_duration, actual_length, False)
-            note_wave = np.sign(np.sin(2 * np.pi * freq * t))
-            
-            # 应用包络 - 确保长度匹配
-            adsr = ADSRParams(attack=0.01, decay=0.05, sustain=0.8, release=0.04)
-            envelope = self.envelope_proc.generate_adsr_envelope(note_duration, adsr)
-            
-            # 确保包络长度与波形长度匹配
-            if len(envelope) != actual_length:
-                envelope = self.envelope_proc.generate_adsr_envelope(
-                    actual_length / self.sample_rate, adsr
-                )
-            
-            # 确保长度完全匹配
-            min_len = min(len(note_wave), len(envelope))
-            note_wave = note_wave[:min_len] * envelope[:min_len]
-            
-            wave[start_sample:start_sample + min_len] = note_wave
-        
-        return wave.astype(np.float32)
+        return self._generate_arpeggio(notes, 0.3, adsr)
     
     def generate_explosion_sound(self) -> np.ndarray:
         """
@@ -128,12 +86,16 @@ class SoundEffectGenerator:
         
         # 添加低频成分（更像爆炸）
         low_freq = self.waveform_gen.generate_square_wave(60, duration, 0.3, 0.5)
-        wave = noise * envelope + low_freq * envelope * 0.5
+        # (noise + low_freq * 0.5) * envelope，全部原地计算，不产生临时数组
+        low_freq *= 0.5
+        noise += low_freq
+        noise *= envelope
+        wave = noise
         
         # 归一化
         max_amp = np.max(np.abs(wave))
         if max_amp > 1.0:
-            wave = wave / max_amp
+            wave /= max_amp
         
         return wave.astype(np.float32)
     
@@ -152,7 +114,7 @@ class SoundEffectGenerator:
         # 快速衰减
         adsr = ADSRParams(attack=0.001, decay=0.02, sustain=0.0, release=0.059)
         envelope = self.envelope_proc.generate_adsr_envelope(duration, adsr)
-        wave = wave * envelope
+        wave *= envelope
         
         return wave.astype(np.float32)
     
@@ -170,7 +132,7 @@ class SoundEffectGenerator:
         # 快速衰减
         adsr = ADSRParams(attack=0.001, decay=0.01, sustain=0.0, release=0.039)
         envelope = self.envelope_proc.generate_adsr_envelope(duration, adsr)
-        wave = wave * envelope
+        wave *= envelope
         
         return wave.astype(np.float32)
     
@@ -190,15 +152,15 @@ class SoundEffectGenerator:
         wave2 = self.waveform_gen.generate_square_wave(freq2, duration, 0.5, 0.5)
         
         # 混合并下降
-        wave = (wave1 + wave2) / 2
+        wave1 += wave2
+        wave1 *= 0.5
+        wave = wave1
         
         # 频率下降
-        t = np.linspace(0, duration, len(wave), False)
-        freq_envelope = np.linspace(1.0, 0.7, len(wave))
         # 简化处理：应用音量包络模拟频率下降
         adsr = ADSRParams(attack=0.01, decay=0.1, sustain=0.3, release=0.09)
         envelope = self.envelope_proc.generate_adsr_envelope(duration, adsr)
-        wave = wave * envelope
+        wave *= envelope
         
         return wave.astype(np.float32)
     
@@ -208,16 +170,33 @@ class SoundEffectGenerator:
         
         特点：上升的琶音，更长更华丽
         """
-        duration = 0.6
         # C大调音阶：C-D-E-F-G-A-B-C
         notes = [60, 62, 64, 65, 67, 69, 71, 72]  # C4到C5
+        adsr = ADSRParams(attack=0.01, decay=0.03, sustain=0.7, release=0.06)
         
+        return self._generate_arpeggio(notes, 0.6, adsr)
+    
+    def _generate_arpeggio(self, notes, duration: float, adsr: ADSRParams) -> np.ndarray:
+        """
+        生成琶音：按顺序等分时长依次播放各个音符（方波）
+        
+        Args:
+            notes: MIDI音符列表
+            duration: 总持续时间（秒）
+            adsr: 每个音符使用的ADSR包络
+        
+        Returns:
+            音效数据数组
+        """
         num_samples = int(self.sample_rate * duration)
         wave = np.zeros(num_samples)
         
         note_duration = duration / len(notes)
         note_samples = int(self.sample_rate * note_duration)
         
+        # 各音符时长相同，包络只需生成一次
+        note_envelope = self.envelope_proc.generate_adsr_envelope(note_duration, adsr)
+        
         for i, midi_note in enumerate(notes):
             freq = self.waveform_gen.midi_to_frequency(midi_note)
             start_sample = i * note_samples
@@ -232,13 +211,12 @@ class SoundEffectGenerator:
             # 计算实际长度
             actual_length = end_sample - start_sample
             
-            # 生成音符波形
-            t = np.linspace(0, note_duration, actual_length, False)
-            note_wave = np.sign(np.sin(2 * np.pi * freq * t))
+            # 生成方波：前半周期为 1，后半周期为 -1
+            phase = np.arange(actual_length) * (freq / self.sample_rate)
+            note_wave = np.where(np.mod(phase, 1.0, out=phase) < 0.5, 1.0, -1.0)
             
             # 应用包络 - 确保长度匹配
-            adsr = ADSRParams(attack=0.01, decay=0.03, sustain=0.7, release=0.06)
-            envelope = self.envelope_proc.generate_adsr_envelope(note_duration, adsr)
+            envelope = note_envelope
             
             # 确保包络长度与波形长度匹配
             if len(envelope) != actual_length:
@@ -22,6 +22,11 @@ def test_waveform_generator():
     assert len(square) > 0, "方波生成失败"
     print("[OK] 方波生成成功")
     
+    # 测试方波占空比：高电平所占比例应等于占空比
+    square_25 = generator.generate_square_wave(441, 1.0, 1.0, 0.25)
+    assert abs(np.mean(square_25 > 0) - 0.25) < 0.01, "方波占空比错误"
+    print("[OK] 方波占空比正确")
+    
     # 测试三角波
     triangle = generator.generate_triangle_wave(440, 0.5, 1.0)
     assert len(triangle) > 0, "三角波生成失败"